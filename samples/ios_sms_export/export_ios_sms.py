@@ -22,16 +22,57 @@ as iMazing, iExplorer, or the native macOS Finder/iTunes export option.
 from __future__ import annotations
 
 import argparse
-import datetime as _dt
+from concurrent.futures import ThreadPoolExecutor
+import itertools
+import os
 from pathlib import Path
-import re
 import shutil
 import sqlite3
-from typing import List, Optional, Sequence, Tuple
+import string
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+# Sekunden zwischen der Unix-Epoche und dem 1. Januar 2001 (Apple-Epoche).
+APPLE_EPOCH_UNIX = 978307200
+ATTACHMENT_ANCHOR = "Library/SMS/Attachments/"
+# Trennzeichen (ASCII Unit Separator, CHAR(31)) für die per GROUP_CONCAT
+# zusammengefassten Anhänge einer Nachricht.
+ATTACHMENT_SEPARATOR = "\x1f"
+# Die Backup-Datenbank wird nur gelesen. Cache, temp_store und mmap bleiben
+# bewusst auf den SQLite-Standardwerten: Die Sortierung für ORDER BY darf so auf
+# Platte ausweichen, statt pro Verbindung das ganze Ergebnis im RAM zu halten.
+READ_ONLY_PRAGMAS = ("PRAGMA query_only = 1",)
+# Obergrenze für parallel exportierte Kontakte (jeweils mit eigener Verbindung).
+MAX_EXPORT_WORKERS = 8
+# Anzahl formatierter Zeilen, die gesammelt und mit einem write() geschrieben werden.
+WRITE_CHUNK_ROWS = 4096
+# Puffergröße für Anhangskopien, falls kein nativer Kopierpfad verfügbar ist.
+COPY_BUFSIZE = 1024 * 1024
+_FILENAME_SAFE = frozenset(string.ascii_letters + string.digits + "._-")
+# Platzhalter für ersetzte Zeichen, damit nur deren Folgen zusammengefasst werden.
+_FILENAME_MARKER = "\0"
+
+
+class _FilenameTranslation(dict):
+    """``str.translate`` table mapping characters outside ``[\\w.-]`` to a marker.
+
+    ASCII wird beim Laden vorberechnet; Nicht-ASCII-Zeichen werden beim ersten
+    Auftreten wie ``\\w`` in :mod:`re` über :meth:`str.isalnum` eingeordnet.
+    """
+
+    def __missing__(self, codepoint: int) -> int:
+        value = codepoint if chr(codepoint).isalnum() else ord(_FILENAME_MARKER)
+        self[codepoint] = value
+        return value
 
 
-APPLE_EPOCH = _dt.datetime(2001, 1, 1)
-ATTACHMENT_ANCHOR = re.compile(r"Library/SMS/Attachments/(.*)")
+_FILENAME_TRANSLATION = _FilenameTranslation(
+    {
+        cp: cp if chr(cp) in _FILENAME_SAFE else ord(_FILENAME_MARKER)
+        for cp in range(128)
+    }
+)
 
 
 def parse_args() -> argparse.Namespace:
@@ -77,6 +118,15 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Anhänge (Fotos, Videos, Audio) in ein Unterverzeichnis kopieren.",
     )
+    parser.add_argument(
+        "--hardlink-media",
+        action="store_true",
+        help=(
+            "Anhänge als Hardlinks statt als Kopien anlegen, sofern Backup und "
+            "Ziel auf demselben Dateisystem liegen. Achtung: Hardlinks teilen "
+            "Inhalt und Metadaten mit der Datei im Backup."
+        ),
+    )
     parser.add_argument(
         "--overwrite",
         action="store_true",
@@ -90,39 +140,21 @@ def parse_args() -> argparse.Namespace:
         parser.error(
             "--attachments-root ist erforderlich, um Mediendateien zu exportieren."
         )
+    if args.hardlink_media and not args.include_media:
+        parser.error(
+            "--hardlink-media kann nur zusammen mit --include-media verwendet werden."
+        )
     return args
 
 
-def apple_timestamp_to_datetime(value: Optional[int]) -> Optional[_dt.datetime]:
-    """Convert Apple Core Data timestamps to :class:`datetime.datetime`.
-
-    iOS speichert Zeitstempel seit dem 1. Januar 2001 in Nanosekunden. Ältere
-    Backups können Sekundenwerte verwenden. Diese Hilfsfunktion normalisiert
-    beide Varianten.
-    """
-
-    if value is None:
-        return None
-    try:
-        # sqlite can return floats (Catalina) or ints (Big Sur+)
-        value = int(value)
-    except (TypeError, ValueError):
-        return None
-
-    if value == 0:
-        return None
-
-    # Werte größer als 10^12 sind üblicherweise Nanosekunden.
-    if value > 10**12:
-        seconds = value / 1_000_000_000
-    else:
-        seconds = value
-
-    return APPLE_EPOCH + _dt.timedelta(seconds=seconds)
-
-
 def sanitize_filename(handle: str) -> str:
-    sanitized = re.sub(r"[^\w.-]+", "_", handle.strip())
+    # Wie re.sub(r"[^\w.-]+", "_", ...): nur Folgen ersetzter Zeichen werden zu
+    # einem einzelnen "_", vorhandene Unterstriche bleiben erhalten.
+    sanitized = handle.strip().translate(_FILENAME_TRANSLATION)
+    double_marker = _FILENAME_MARKER * 2
+    while double_marker in sanitized:
+        sanitized = sanitized.replace(double_marker, _FILENAME_MARKER)
+    sanitized = sanitized.replace(_FILENAME_MARKER, "_")
     return sanitized or "contact"
 
 
@@ -134,13 +166,59 @@ def ensure_output_path(path: Path, overwrite: bool = False) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
 
 
-def resolve_attachment_path(raw_path: Optional[str], attachments_root: Path) -> Optional[Path]:
+def build_attachment_index(attachments_root: Path) -> Dict[str, Path]:
+    """Index every file of the attachments tree by its relative POSIX path.
+
+    Der Baum wird einmalig mit :func:`os.scandir` durchlaufen, damit für die
+    meisten Anhänge ein Dictionary-Zugriff statt mehrerer ``stat``-Aufrufe
+    genügt.
+    """
+
+    base = attachments_root / "Library" / "SMS" / "Attachments"
+    if not base.is_dir():
+        # Einige Exporte enthalten keine führende Struktur.
+        base = attachments_root
+
+    index: Dict[str, Path] = {}
+    pending = [(str(base), "")]
+    while pending:
+        directory, prefix = pending.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            # Nicht lesbare Verzeichnisse überspringen; ihre Anhänge gelten wie
+            # bisher als nicht gefunden.
+            continue
+        with entries:
+            for entry in entries:
+                relative = prefix + entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append((entry.path, relative + "/"))
+                elif entry.is_file():
+                    # Folgt Symlinks; defekte Links und Links auf Verzeichnisse
+                    # werden nicht aufgenommen.
+                    index[relative] = Path(entry.path)
+    return index
+
+
+def resolve_attachment_path(
+    raw_path: Optional[str],
+    attachments_root: Path,
+    attachment_index: Dict[str, Path],
+) -> Optional[Path]:
     if not raw_path:
         return None
-    match = ATTACHMENT_ANCHOR.search(raw_path)
-    if not match:
+    _, sep, tail = raw_path.partition(ATTACHMENT_ANCHOR)
+    if not sep:
         return None
-    relative = Path(match.group(1))
+    candidate = attachment_index.get(tail)
+    if candidate:
+        return candidate
+
+    # Nicht im Index: direkt beim Dateisystem nachfragen. Unter macOS und
+    # Windows ignoriert es Groß-/Kleinschreibung bzw. Unicode-Normalisierung
+    # (z. B. NFD-Namen auf HFS+), was der exakte Index nicht abbildet.
+    relative = Path(tail)
     candidate = attachments_root / "Library" / "SMS" / "Attachments" / relative
     if candidate.exists():
         return candidate
@@ -149,71 +227,191 @@ def resolve_attachment_path(raw_path: Optional[str], attachments_root: Path) ->
     return candidate if candidate.exists() else None
 
 
+def copy_attachment(source: Path, destination: Path, hardlink: bool = False) -> None:
+    """Copy an attachment including its metadata, like :func:`shutil.copy2`.
+
+    Mit ``hardlink`` wird zuerst :func:`os.link` versucht, was unabhängig von
+    der Dateigröße sofort erledigt ist. Liegt das Ziel auf einem anderen
+    Dateisystem oder unterstützt dieses keine Hardlinks, wird normal kopiert.
+
+    Unter Windows, macOS und Linux nutzt :func:`shutil.copy2` bereits native
+    Kopierpfade (``CopyFile2``, ``fcopyfile`` bzw. ``sendfile``). Auf anderen
+    Plattformen kopiert shutil mit einem 64-KB-Puffer, was große Videos auf
+    Netzlaufwerken ausbremst; dort wird stattdessen mit ``COPY_BUFSIZE`` kopiert.
+    """
+
+    if hardlink:
+        try:
+            os.link(source, destination)
+            return
+        except OSError:
+            pass
+    if sys.platform in ("win32", "darwin") or sys.platform.startswith("linux"):
+        shutil.copy2(source, destination)
+        return
+    with source.open("rb") as src, destination.open("wb") as dst:
+        shutil.copyfileobj(src, dst, length=COPY_BUFSIZE)
+    shutil.copystat(source, destination)
+
+
+def unique_attachment_name(name: str, name_counts: Dict[str, int]) -> str:
+    """Return ``name`` or a ``<stem>_<n><suffix>`` variant not yet used in the export.
+
+    ``name_counts`` enthält jeden bereits vergebenen Namen (ohne Beachtung der
+    Groß-/Kleinschreibung, wie auf macOS- und Windows-Dateisystemen üblich)
+    zusammen mit dem zuletzt dafür vergebenen Zähler. Kollisionen werden so rein
+    im Speicher aufgelöst, ohne das Zielverzeichnis per ``stat`` abzufragen.
+    """
+
+    key = name.casefold()
+    if key not in name_counts:
+        name_counts[key] = 0
+        return name
+
+    path = Path(name)
+    count = name_counts[key]
+    while True:
+        count += 1
+        candidate = f"{path.stem}_{count}{path.suffix}"
+        if candidate.casefold() not in name_counts:
+            break
+    name_counts[key] = count
+    name_counts[candidate.casefold()] = 0
+    return candidate
+
+
 def fetch_messages(
-    connection: sqlite3.Connection, handle_identifier: str
-) -> List[sqlite3.Row]:
-    query = """
+    connection: sqlite3.Connection, handle_identifiers: Sequence[str]
+) -> Iterator[Tuple[str, Iterator[sqlite3.Row]]]:
+    """Stream the messages of all requested contacts from a single query.
+
+    Die Zeilen werden direkt vom Cursor gelesen und nach ``handle.id``
+    gruppiert; Python hält dabei nie mehr als die aktuelle Zeile. Für das
+    ``ORDER BY`` sortiert SQLite das Ergebnis vorab in einem temporären B-Baum,
+    der bei großen Chats in eine temporäre Datei statt in den Speicher
+    ausgelagert wird. Die Zeilen einer Gruppe müssen verarbeitet werden, bevor
+    die nächste Gruppe angefordert wird. Die Gruppen folgen der Reihenfolge von
+    ``handle_identifiers``; Kontakte ohne Nachrichten werden an ihrer Position
+    mit einem leeren Iterator geliefert.
+
+    Die Handles werden zuerst in einer CTE aufgelöst; ``CROSS JOIN`` zwingt
+    SQLite, von dort aus über ``message.handle_id`` zu suchen, statt die
+    gesamte ``message``-Tabelle zu scannen. Die Anhänge werden über
+    korrelierte Unterabfragen pro Nachricht gesammelt, damit neben der
+    Sortierung kein zusätzlicher B-Baum für ein ``GROUP BY`` nötig ist.
+
+    Zeitstempel formatiert SQLite mit seinen eingebauten, in C implementierten
+    Datumsfunktionen direkt als ``ts_text``. iOS speichert sie seit dem
+    1. Januar 2001 in Nanosekunden, ältere Backups in Sekunden; Werte über 10^12
+    gelten als Nanosekunden. ``NULL``, ``0`` und Werte außerhalb des von SQLite
+    unterstützten Bereichs ergeben ``NULL``. Jede Nachricht ergibt genau eine
+    Zeile; ihre Anhänge stehen durch ``ATTACHMENT_SEPARATOR`` getrennt in
+    ``filenames`` und ``transfer_names``.
+    """
+
+    requested = ", ".join(
+        f"(?, {position})" for position in range(len(handle_identifiers))
+    )
+    query = f"""
+        WITH requested(id, position) AS (VALUES {requested}),
+        hs AS (
+            SELECT h.ROWID AS handle_rowid, r.id, r.position
+            FROM requested AS r
+            JOIN handle AS h ON h.id = r.id
+        )
         SELECT
+            hs.id AS handle_identifier,
             m.ROWID AS message_id,
             m.handle_id,
-            m.date,
-            m.is_from_me,
+            strftime(
+                '%Y-%m-%d %H:%M:%S',
+                CASE
+                    WHEN CAST(m.date AS INTEGER) > 1000000000000
+                    THEN CAST(m.date AS INTEGER) / 1000000000
+                    ELSE NULLIF(CAST(m.date AS INTEGER), 0)
+                END + {APPLE_EPOCH_UNIX},
+                'unixepoch'
+            ) AS ts_text,
+            IFNULL(m.is_from_me, 0) != 0 AS is_from_me,
             m.text,
             m.cache_roomnames,
-            a.filename,
-            a.transfer_name,
-            a.mime_type
-        FROM message AS m
-        JOIN handle AS h ON h.ROWID = m.handle_id
-        LEFT JOIN message_attachment_join AS maj ON maj.message_id = m.ROWID
-        LEFT JOIN attachment AS a ON a.ROWID = maj.attachment_id
-        WHERE h.id = ?
-        ORDER BY m.date, m.ROWID
+            (
+                SELECT GROUP_CONCAT(IFNULL(a.filename, ''), CHAR(31))
+                FROM message_attachment_join AS maj
+                LEFT JOIN attachment AS a ON a.ROWID = maj.attachment_id
+                WHERE maj.message_id = m.ROWID
+            ) AS filenames,
+            (
+                SELECT GROUP_CONCAT(IFNULL(a.transfer_name, ''), CHAR(31))
+                FROM message_attachment_join AS maj
+                LEFT JOIN attachment AS a ON a.ROWID = maj.attachment_id
+                WHERE maj.message_id = m.ROWID
+            ) AS transfer_names
+        FROM hs
+        CROSS JOIN message AS m ON m.handle_id = hs.handle_rowid
+        ORDER BY hs.position, m.date, m.ROWID
     """
-    cur = connection.execute(query, (handle_identifier,))
-    return cur.fetchall()
+    cur = connection.execute(query, tuple(handle_identifiers))
+    pending = iter(handle_identifiers)
+    for handle_identifier, rows in itertools.groupby(
+        cur, key=lambda row: row["handle_identifier"]
+    ):
+        # Übersprungene Kontakte davor haben keine Nachrichten.
+        for missing in itertools.takewhile(
+            lambda requested_id: requested_id != handle_identifier, pending
+        ):
+            yield missing, iter(())
+        yield handle_identifier, rows
+    for missing in pending:
+        yield missing, iter(())
 
 
 def format_message(
     row: sqlite3.Row,
-    handle_identifier: str,
+    senders: Tuple[str, str],
     attachments_dir: Optional[Path],
     attachments_root: Optional[Path],
+    attachment_index: Optional[Dict[str, Path]],
     include_media: bool,
+    name_counts: Dict[str, int],
+    hardlink_media: bool = False,
 ) -> Tuple[str, List[str]]:
-    timestamp = apple_timestamp_to_datetime(row["date"])
-    if timestamp is None:
-        timestamp_text = "Unbekannte Zeit"
-    else:
-        timestamp_text = timestamp.strftime("%Y-%m-%d %H:%M:%S")
+    timestamp_text = row["ts_text"] or "Unbekannte Zeit"
 
-    sender = "Ich" if row["is_from_me"] else handle_identifier
-    body = (row["text"] or "").replace("\r\n", "\n").replace("\r", "\n")
-    if not body:
-        body = "(kein Text)"
+    # is_from_me ist per Abfrage auf 0/1 normalisiert und indiziert ``senders``.
+    sender = senders[row["is_from_me"]]
+    body = row["text"] or "(kein Text)"
+    if "\r" in body:
+        body = body.replace("\r\n", "\n").replace("\r", "\n")
 
     attachments: List[str] = []
-    attachment_path = None
-    if include_media and attachments_dir and attachments_root:
-        attachment_path = resolve_attachment_path(row["filename"], attachments_root)
-        if attachment_path:
-            attachments_dir.mkdir(parents=True, exist_ok=True)
-            destination_name = row["transfer_name"] or attachment_path.name
-            destination = attachments_dir / destination_name
-
-            suffix = 1
-            base_name = destination.stem
-            suffix_str = destination.suffix
-            while destination.exists():
-                destination = attachments_dir / f"{base_name}_{suffix}{suffix_str}"
-                suffix += 1
-
-            shutil.copy2(attachment_path, destination)
+    if include_media and row["filenames"]:
+        # IFNULL hält beide Listen gleich lang; die zwei Unterabfragen lesen die
+        # Anhänge über denselben Plan und damit in derselben Reihenfolge.
+        filenames = row["filenames"].split(ATTACHMENT_SEPARATOR)
+        transfer_names = row["transfer_names"].split(ATTACHMENT_SEPARATOR)
+        for filename, transfer_name in zip(filenames, transfer_names):
+            if not filename:
+                continue
+            attachment_path = None
+            if attachments_dir and attachments_root and attachment_index is not None:
+                attachment_path = resolve_attachment_path(
+                    filename, attachments_root, attachment_index
+                )
+            if not attachment_path:
+                attachments.append("(Anhang nicht gefunden im Backup)")
+                continue
+            if not name_counts:
+                # Erster kopierter Anhang dieses Kontakts: Verzeichnis einmalig
+                # anlegen, damit Kontakte ohne Anhänge keinen leeren Ordner erhalten.
+                attachments_dir.mkdir(parents=True, exist_ok=True)
+            destination_name = transfer_name or attachment_path.name
+            destination = attachments_dir / unique_attachment_name(
+                destination_name, name_counts
+            )
+            copy_attachment(attachment_path, destination, hardlink=hardlink_media)
             attachments.append(destination.name)
 
-    if row["filename"] and include_media and not attachment_path:
-        attachments.append("(Anhang nicht gefunden im Backup)")
-
     attachment_note = ""
     if attachments:
         attachment_note = " " + ", ".join(f"[Anhang: {name}]" for name in attachments)
@@ -222,12 +420,14 @@ def format_message(
 
 
 def export_for_contact(
-    connection: sqlite3.Connection,
+    rows: Iterable[sqlite3.Row],
     handle_identifier: str,
     output_dir: Path,
     attachments_root: Optional[Path],
+    attachment_index: Optional[Dict[str, Path]],
     include_media: bool,
     overwrite: bool,
+    hardlink_media: bool = False,
 ) -> Path:
     sanitized = sanitize_filename(handle_identifier)
     text_path = output_dir / f"{sanitized}.txt"
@@ -243,56 +443,151 @@ def export_for_contact(
         if attachments_dir.exists() and overwrite:
             shutil.rmtree(attachments_dir)
 
-    rows = fetch_messages(connection, handle_identifier)
-    if not rows:
+    rows = iter(rows)
+    first_row = next(rows, None)
+    if first_row is None:
         raise ValueError(
             "Keine Nachrichten für Kontakt '{handle}' gefunden.".format(
                 handle=handle_identifier
             )
         )
 
+    senders = (handle_identifier, "Ich")
+    name_counts: Dict[str, int] = {}
     with text_path.open("w", encoding="utf-8") as fh:
-        for row in rows:
+        parts: List[str] = []
+        for row in itertools.chain((first_row,), rows):
             line, _ = format_message(
                 row=row,
-                handle_identifier=handle_identifier,
+                senders=senders,
                 attachments_dir=attachments_dir,
                 attachments_root=attachments_root,
+                attachment_index=attachment_index,
                 include_media=include_media,
+                name_counts=name_counts,
+                hardlink_media=hardlink_media,
             )
-            fh.write(line + "\n")
+            parts.append(line)
+            if len(parts) >= WRITE_CHUNK_ROWS:
+                fh.write("\n".join(parts) + "\n")
+                parts.clear()
+        if parts:
+            fh.write("\n".join(parts) + "\n")
 
     return text_path
 
 
-def export_chats(
+def connect_read_only(sms_db: Path) -> sqlite3.Connection:
+    """Open ``sms_db`` read-only and prepare it for the export queries."""
+
+    sms_db = sms_db.resolve()
+    # iOS legt sms.db im WAL-Modus an. Eine mode=ro-Verbindung würde dabei
+    # sms.db-shm/-wal neben der Datenbank anlegen und beim Schließen nicht
+    # wieder entfernen. Ohne vorhandene -wal-Datei enthält die Hauptdatei alle
+    # Daten; immutable=1 liest sie dann ohne Sperren und ohne Nebendateien.
+    # Liegt eine -wal-Datei vor, muss SQLite sie auswerten (siehe README).
+    wal_path = sms_db.with_name(sms_db.name + "-wal")
+    params = "mode=ro" if wal_path.exists() else "mode=ro&immutable=1"
+    connection = sqlite3.connect(f"{sms_db.as_uri()}?{params}", uri=True)
+    connection.row_factory = sqlite3.Row
+    for pragma in READ_ONLY_PRAGMAS:
+        connection.execute(pragma)
+    return connection
+
+
+def export_contact_batch(
     sms_db: Path,
-    attachments_root: Optional[Path],
-    contacts: Sequence[str],
+    handle_identifiers: Sequence[str],
     output_dir: Path,
+    attachments_root: Optional[Path],
+    attachment_index: Optional[Dict[str, Path]],
     include_media: bool,
     overwrite: bool,
-) -> List[Path]:
-    connection = sqlite3.connect(str(sms_db))
-    connection.row_factory = sqlite3.Row
+    hardlink_media: bool = False,
+) -> Dict[str, Path]:
+    """Export a group of contacts over a dedicated database connection.
+
+    SQLite-Verbindungen dürfen nicht zwischen Threads geteilt werden, daher
+    öffnet jeder Aufruf seine eigene Verbindung und schließt sie wieder.
+    """
+
+    connection = connect_read_only(sms_db)
     try:
-        exported: List[Path] = []
-        for handle_identifier in contacts:
+        # Ein einziger Lese-Transaktionsrahmen für den gesamten Export vermeidet
+        # das Sperren und Freigeben der Datenbank pro Statement.
+        connection.execute("BEGIN")
+        exported: Dict[str, Path] = {}
+        for handle_identifier, rows in fetch_messages(connection, handle_identifiers):
             print(f"Exportiere Nachrichten für {handle_identifier!r}...")
-            exported_path = export_for_contact(
-                connection,
+            exported[handle_identifier] = export_for_contact(
+                rows,
                 handle_identifier=handle_identifier,
                 output_dir=output_dir,
                 attachments_root=attachments_root,
+                attachment_index=attachment_index,
                 include_media=include_media,
                 overwrite=overwrite,
+                hardlink_media=hardlink_media,
             )
-            exported.append(exported_path)
+        connection.commit()
     finally:
         connection.close()
     return exported
 
 
+def export_chats(
+    sms_db: Path,
+    attachments_root: Optional[Path],
+    contacts: Sequence[str],
+    output_dir: Path,
+    include_media: bool,
+    overwrite: bool,
+    hardlink_media: bool = False,
+) -> List[Path]:
+    handle_identifiers = list(dict.fromkeys(contacts))
+    if not handle_identifiers:
+        return []
+
+    attachment_index: Optional[Dict[str, Path]] = None
+    if include_media and attachments_root:
+        attachment_index = build_attachment_index(attachments_root)
+
+    # Kontakte, die auf denselben Dateinamen abgebildet werden, landen im selben
+    # Batch und werden dort in Eingabereihenfolge nacheinander exportiert, statt
+    # parallel in dieselben Dateien und Anhangsverzeichnisse zu schreiben.
+    by_filename: Dict[str, List[str]] = {}
+    for handle_identifier in handle_identifiers:
+        by_filename.setdefault(sanitize_filename(handle_identifier), []).append(
+            handle_identifier
+        )
+
+    # Der Export ist I/O-lastig (SQLite, Textdateien, Medienkopien); Threads
+    # geben dabei die GIL frei und können sich gegenseitig überlappen.
+    max_workers = min(MAX_EXPORT_WORKERS, len(by_filename))
+    batches: List[List[str]] = [[] for _ in range(max_workers)]
+    for i, group in enumerate(by_filename.values()):
+        batches[i % max_workers].extend(group)
+    exported: Dict[str, Path] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                export_contact_batch,
+                sms_db,
+                batch,
+                output_dir=output_dir,
+                attachments_root=attachments_root,
+                attachment_index=attachment_index,
+                include_media=include_media,
+                overwrite=overwrite,
+                hardlink_media=hardlink_media,
+            )
+            for batch in batches
+        ]
+        for future in futures:
+            exported.update(future.result())
+    return [exported[handle_identifier] for handle_identifier in handle_identifiers]
+
+
 def main() -> None:
     args = parse_args()
     sms_db = args.sms_db.expanduser().resolve()
@@ -317,6 +612,7 @@ def main() -> None:
         output_dir=output_dir,
         include_media=args.include_media,
         overwrite=args.overwrite,
+        hardlink_media=args.hardlink_media,
     )
 
     print("Fertig! Exportierte Dateien:")